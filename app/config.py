@@ -16,6 +16,50 @@ class Settings(BaseSettings):
     )
     app_name: str = Field(default="Frontend Monitoring Backend")
     debug: bool = Field(default=False)
+    timeseries_max_points: int = Field(
+        default=1000,
+        description="Maximum number of buckets a timeseries request may return.",
+    )
+    live_tail_buffer_size: int = Field(
+        default=1000,
+        description="Events buffered per live-tail subscriber before the oldest are dropped.",
+    )
+    idempotency_window_seconds: float = Field(
+        default=3600,
+        description="How long ingested idempotency keys are remembered for duplicate detection.",
+    )
+    idempotency_derive_keys: bool = Field(
+        default=False,
+        description="Key requests without an Idempotency-Key header by a hash of their body.",
+    )
+    idempotency_bloom_capacity: int = Field(
+        default=100_000,
+        description="Expected idempotency keys per project and window, used to size Bloom filters.",
+    )
+    idempotency_bloom_error_rate: float = Field(
+        default=0.01,
+        description="Target false positive rate of the idempotency Bloom filters.",
+    )
+    query_profiling: bool = Field(
+        default=False,
+        description="Report per-request SQL timings in the X-Query-Profile response header.",
+    )
+    slow_query_log_path: Optional[str] = Field(
+        default=None,
+        description="JSON lines file receiving statements slower than slow_query_threshold_ms.",
+    )
+    slow_query_threshold_ms: float = Field(
+        default=250.0,
+        description="Statements at least this slow are written to the slow query log.",
+    )
+    alert_rules_refresh_seconds: float = Field(
+        default=30.0,
+        description="How long a worker caches a project's alert rules before reloading them.",
+    )
+    alert_checkpoint_seconds: float = Field(
+        default=60.0,
+        description="How often in-memory alert counters are written back to the database.",
+    )
 
     class Config:
         env_prefix = "MONITORING_"
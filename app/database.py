@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Optional
 
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, SQLModel, create_engine, select
 
 from .config import get_settings
+from .models import Event, to_epoch
 
 
 def _create_engine():
@@ -26,10 +29,48 @@ def _create_engine():
 engine = _create_engine()
 
 
-def init_db() -> None:
-    """Create database tables if they do not exist."""
-
-    SQLModel.metadata.create_all(engine)
+def init_db(bind: Optional[Engine] = None) -> None:
+    """Create database tables if they do not exist and upgrade older schemas in place."""
+
+    bind = bind or engine
+    with bind.begin() as connection:
+        SQLModel.metadata.create_all(connection)
+        _upgrade_schema(connection)
+
+
+def _upgrade_schema(connection: Connection) -> None:
+    """Add columns and indexes introduced after a table was first created.
+
+    ``create_all`` never alters existing tables, so columns are added here as
+    nullable and backfilled. Running it against an up-to-date schema is a no-op.
+    """
+
+    inspector = inspect(connection)
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+            if table.name == Event.__tablename__ and column.name == "occurred_ts":
+                _backfill_occurred_ts(connection)
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _backfill_occurred_ts(connection: Connection) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(
+            "UPDATE events SET occurred_ts = CAST(strftime('%s', occurred_at) AS INTEGER) "
+            "WHERE occurred_ts IS NULL"
+        )
+        return
+    rows = connection.execute(select(Event.id, Event.occurred_at).where(Event.occurred_ts.is_(None))).all()
+    for event_id, occurred_at in rows:
+        connection.execute(
+            Event.__table__.update().where(Event.id == event_id).values(occurred_ts=to_epoch(occurred_at))
+        )
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -4,7 +4,8 @@ from fastapi import FastAPI
 
 from .config import get_settings
 from .database import init_db
-from .routers import events, projects, stats
+from .routers import alerts, events, projects, stats
+from .utils.profiling import QueryProfilingMiddleware
 
 
 def create_app() -> FastAPI:
@@ -15,9 +16,12 @@ def create_app() -> FastAPI:
     def _startup() -> None:  # pragma: no cover - minimal boot hook
         init_db()
 
+    app.add_middleware(QueryProfilingMiddleware)
+
     app.include_router(projects.router)
     app.include_router(events.router)
     app.include_router(stats.router)
+    app.include_router(alerts.router)
 
     return app
 
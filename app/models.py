@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, Optional
+from urllib.parse import urlparse
 
-from sqlalchemy import Column, JSON
+from pydantic import validator
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, SQLModel
 
 
@@ -15,6 +17,14 @@ class EventType(str, Enum):
     CUSTOM = "custom"
 
 
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert timezone-aware datetimes to naive UTC, the form stored in the database."""
+
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 class ProjectBase(SQLModel):
     name: str = Field(index=True, description="Human friendly project name.")
     description: Optional[str] = Field(default=None, description="Optional description of the project.")
@@ -65,13 +75,42 @@ class EventBase(SQLModel):
         description="Timestamp at which the event occurred on the client side.",
     )
 
+    _normalize_occurred_at = validator("occurred_at", allow_reuse=True)(to_naive_utc)
+
+
+def to_epoch(value: datetime) -> int:
+    """Convert a datetime to integer epoch seconds, treating naive values as UTC."""
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _occurred_ts_default(context) -> int:
+    return to_epoch(context.get_current_parameters()["occurred_at"])
+
 
 class Event(EventBase, table=True):
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_project_occurred_ts", "project_id", "occurred_ts"),
+        Index("ix_events_project_idempotency_key", "project_id", "idempotency_key"),
+        Index("ix_events_project_session_occurred", "project_id", "session_id", "occurred_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     project_id: int = Field(foreign_key="projects.id", index=True, nullable=False)
     received_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    occurred_ts: Optional[int] = Field(
+        default=None,
+        sa_column_kwargs={"default": _occurred_ts_default, "nullable": False},
+        description="Epoch seconds of occurred_at, used for index-friendly bucketing.",
+    )
+    idempotency_key: Optional[str] = Field(
+        default=None,
+        max_length=255,
+        description="Client supplied or derived key used to discard retried ingestions.",
+    )
 
 
 class EventRead(EventBase):
@@ -95,3 +134,72 @@ class EventQueryParams(SQLModel):
     page_size: int = 50
     occurred_from: Optional[datetime] = None
     occurred_to: Optional[datetime] = None
+
+    _normalize_range = validator("occurred_from", "occurred_to", allow_reuse=True)(to_naive_utc)
+
+
+def is_http_url(value: str) -> bool:
+    parsed = urlparse(value)
+    return parsed.scheme in {"http", "https"} and bool(parsed.netloc)
+
+
+class AlertKind(str, Enum):
+    THRESHOLD = "threshold"
+    RATE_CHANGE = "rate_change"
+
+
+class AlertRuleBase(SQLModel):
+    name: str = Field(description="Human friendly rule name.")
+    kind: AlertKind = Field(default=AlertKind.THRESHOLD, sa_column_kwargs={"nullable": False})
+    event_type: Optional[EventType] = Field(default=None, description="Only count events of this type.")
+    window_seconds: int = Field(default=300, gt=0, description="Length of the sliding window.")
+    threshold: float = Field(
+        gt=0,
+        description="Event count (threshold) or ratio to the baseline (rate_change) that fires the alert.",
+    )
+    baseline_windows: int = Field(
+        default=6,
+        ge=1,
+        le=168,
+        description="Number of preceding windows averaged into the rate_change baseline.",
+    )
+    min_events: int = Field(default=1, ge=0, description="Minimum events in the window before rate_change fires.")
+    cooldown_seconds: int = Field(default=300, ge=0, description="Minimum delay between two firings.")
+    webhook_url: Optional[str] = Field(
+        default=None,
+        max_length=2048,
+        description="HTTP(S) URL receiving a JSON POST when the rule fires.",
+    )
+
+    @validator("webhook_url")
+    def _check_webhook_url(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and not is_http_url(value):
+            raise ValueError("webhook_url must be an http or https URL")
+        return value
+
+
+class AlertRule(AlertRuleBase, table=True):
+    __tablename__ = "alert_rules"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    project_id: int = Field(foreign_key="projects.id", index=True, nullable=False)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    last_fired_at: Optional[datetime] = Field(default=None)
+    counter_state: Optional[Dict[str, Any]] = Field(
+        sa_column=Column(JSON),
+        default=None,
+        description="Checkpoint of the in-memory sliding window counter.",
+    )
+
+
+class AlertRuleRead(AlertRuleBase):
+    id: int
+    project_id: int
+    created_at: datetime
+    last_fired_at: Optional[datetime] = None
+    current_count: int = 0
+    baseline: Optional[float] = None
+
+
+class AlertRuleCreate(AlertRuleBase):
+    pass
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlmodel import Session
+
+from ..database import get_session
+from ..models import AlertRuleCreate, AlertRuleRead
+from ..services.alert_service import AlertService
+from ..services.project_service import ProjectService
+
+router = APIRouter(prefix="/api/alerts", tags=["alerts"])
+
+
+def get_services(session: Session = Depends(get_session)) -> tuple[AlertService, ProjectService]:
+    return AlertService(session), ProjectService(session)
+
+
+@router.post("/project/{project_id}", response_model=AlertRuleRead, status_code=status.HTTP_201_CREATED)
+def create_rule(
+    project_id: int,
+    payload: AlertRuleCreate,
+    services: tuple[AlertService, ProjectService] = Depends(get_services),
+) -> AlertRuleRead:
+    alert_service, project_service = services
+    project_service.get_project(project_id)
+    return alert_service.create_rule(project_id, payload)
+
+
+@router.get("/project/{project_id}", response_model=list[AlertRuleRead])
+def list_rules(
+    project_id: int,
+    services: tuple[AlertService, ProjectService] = Depends(get_services),
+) -> list[AlertRuleRead]:
+    alert_service, project_service = services
+    project_service.get_project(project_id)
+    return alert_service.list_rules(project_id)
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_rule(rule_id: int, services: tuple[AlertService, ProjectService] = Depends(get_services)) -> Response:
+    alert_service, _ = services
+    alert_service.delete_rule(rule_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
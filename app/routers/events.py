@@ -3,16 +3,24 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
+from ..config import get_settings
 from ..database import get_session
 from ..models import EventCreate, EventQueryParams, EventRead, EventType
+from ..services.event_bus import event_bus
 from ..services.event_service import EventService
+from ..services.idempotency import derive_idempotency_key
 from ..services.project_service import ProjectService
+from ..utils import profiling
+from ..utils.serialization import dumps, json_response
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
+TAIL_HEARTBEAT_SECONDS = 15.0
+
 
 def get_services(session: Session = Depends(get_session)) -> tuple[EventService, ProjectService]:
     return EventService(session), ProjectService(session)
@@ -21,41 +29,92 @@ def get_services(session: Session = Depends(get_session)) -> tuple[EventService,
 @router.post("", response_model=EventRead, status_code=status.HTTP_201_CREATED)
 def ingest_event(
     payload: EventCreate,
+    response: Response,
     api_key: str = Header(..., alias="X-API-Key"),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", max_length=255),
     services: tuple[EventService, ProjectService] = Depends(get_services),
 ) -> EventRead:
     event_service, project_service = services
     project = project_service.get_project_by_key(api_key)
-    return event_service.record_event(project, payload)
+    key = idempotency_key or derive_idempotency_key(payload)
+    if key:
+        existing = event_service.find_duplicate(project.id, key)
+        if existing is not None:
+            response.status_code = status.HTTP_200_OK
+            response.headers["Idempotent-Replayed"] = "true"
+            return existing
+    return event_service.record_event(project, payload, key)
 
 
-@router.get("/project/{project_id}")
-def list_events(
-    project_id: int,
+def get_event_filters(
     event_type: Optional[EventType] = Query(default=None),
     user_id: Optional[str] = Query(default=None),
     session_id: Optional[str] = Query(default=None),
     environment: Optional[str] = Query(default=None),
     release: Optional[str] = Query(default=None),
     search: Optional[str] = Query(default=None),
-    page: int = Query(default=1, ge=1),
-    page_size: int = Query(default=50, ge=1, le=200),
     occurred_from: Optional[datetime] = Query(default=None),
     occurred_to: Optional[datetime] = Query(default=None),
-    services: tuple[EventService, ProjectService] = Depends(get_services),
-) -> dict:
-    event_service, project_service = services
-    project_service.read_project(project_id)  # ensure project exists
-    params = EventQueryParams(
+) -> EventQueryParams:
+    filters = EventQueryParams(
         event_type=event_type,
         user_id=user_id,
         session_id=session_id,
         environment=environment,
         release=release,
         search=search,
-        page=page,
-        page_size=page_size,
         occurred_from=occurred_from,
         occurred_to=occurred_to,
     )
-    return event_service.list_events(project_id, params)
+    profiling.annotate(filters=sorted(filters.dict(exclude_defaults=True)))
+    return filters
+
+
+@router.get("/project/{project_id}", response_class=Response)
+def list_events(
+    project_id: int,
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=50, ge=1, le=200),
+    filters: EventQueryParams = Depends(get_event_filters),
+    services: tuple[EventService, ProjectService] = Depends(get_services),
+) -> Response:
+    event_service, project_service = services
+    project_service.get_project(project_id)  # ensure project exists
+    params = filters.copy(update={"page": page, "page_size": page_size})
+    return json_response(event_service.list_events(project_id, params))
+
+
+@router.get("/project/{project_id}/tail", response_class=StreamingResponse)
+def tail_events(
+    project_id: int,
+    request: Request,
+    filters: EventQueryParams = Depends(get_event_filters),
+    services: tuple[EventService, ProjectService] = Depends(get_services),
+) -> StreamingResponse:
+    """Stream newly recorded events matching ``filters`` as Server-Sent Events."""
+
+    _, project_service = services
+    project_service.get_project(project_id)
+    project_service.session.close()  # release the connection before streaming
+    buffer_size = get_settings().live_tail_buffer_size
+
+    async def stream():
+        subscription = event_bus.subscribe(project_id, filters, buffer_size)
+        try:
+            yield b"retry: 3000\n\n"
+            while not await request.is_disconnected():
+                items, dropped = await subscription.get(timeout=TAIL_HEARTBEAT_SECONDS)
+                if dropped:
+                    yield b"event: dropped\ndata: " + dumps({"count": dropped}) + b"\n\n"
+                for event_id, data in items:
+                    yield b"id: %d\nevent: event\ndata: " % event_id + data + b"\n\n"
+                if not items and not dropped:
+                    yield b": keep-alive\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
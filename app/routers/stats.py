@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlmodel import Session
 
 from ..database import get_session
 from ..services.event_service import EventService
 from ..services.project_service import ProjectService
+from ..utils.serialization import json_response
 
 router = APIRouter(prefix="/api/stats", tags=["stats"])
 
@@ -17,26 +18,69 @@ def get_services(session: Session = Depends(get_session)) -> tuple[EventService,
     return EventService(session), ProjectService(session)
 
 
-@router.get("/project/{project_id}/summary")
+@router.get("/overview", response_class=Response)
+def projects_overview(
+    start: Optional[datetime] = Query(default=None, description="Defaults to 24 hours before now."),
+    end: Optional[datetime] = Query(default=None),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=50, ge=1, le=200),
+    sort_by: str = Query(default="total_events"),
+    order: str = Query(default="desc", regex="^(asc|desc)$"),
+    services: tuple[EventService, ProjectService] = Depends(get_services),
+) -> Response:
+    event_service, _ = services
+    if start is None:
+        start = datetime.utcnow() - timedelta(hours=24)
+    return json_response(
+        event_service.overview(start, end, page, page_size, sort_by, descending=order == "desc")
+    )
+
+
+@router.get("/project/{project_id}/summary", response_class=Response)
 def project_summary(
     project_id: int,
     start: Optional[datetime] = Query(default=None),
     end: Optional[datetime] = Query(default=None),
     services: tuple[EventService, ProjectService] = Depends(get_services),
-) -> dict:
+) -> Response:
     event_service, project_service = services
-    project_service.read_project(project_id)
-    return event_service.summary(project_id, start, end)
+    project_service.get_project(project_id)
+    return json_response(event_service.summary(project_id, start, end))
 
 
-@router.get("/project/{project_id}/timeseries")
+@router.get("/project/{project_id}/timeseries", response_class=Response)
 def project_timeseries(
     project_id: int,
     start: Optional[datetime] = Query(default=None),
     end: Optional[datetime] = Query(default=None),
     granularity: str = Query(default="day"),
     services: tuple[EventService, ProjectService] = Depends(get_services),
-) -> list[dict]:
+) -> Response:
+    event_service, project_service = services
+    project_service.get_project(project_id)
+    return json_response(event_service.timeseries(project_id, start, end, granularity))
+
+
+@router.get("/project/{project_id}/sessions", response_class=Response)
+def project_sessions(
+    project_id: int,
+    start: Optional[datetime] = Query(default=None),
+    end: Optional[datetime] = Query(default=None),
+    services: tuple[EventService, ProjectService] = Depends(get_services),
+) -> Response:
+    event_service, project_service = services
+    project_service.get_project(project_id)
+    return json_response(event_service.session_analytics(project_id, start, end).session_summary())
+
+
+@router.get("/project/{project_id}/funnel", response_class=Response)
+def project_funnel(
+    project_id: int,
+    steps: List[str] = Query(..., min_items=1, max_items=20),
+    start: Optional[datetime] = Query(default=None),
+    end: Optional[datetime] = Query(default=None),
+    services: tuple[EventService, ProjectService] = Depends(get_services),
+) -> Response:
     event_service, project_service = services
-    project_service.read_project(project_id)
-    return event_service.timeseries(project_id, start, end, granularity)
+    project_service.get_project(project_id)
+    return json_response(event_service.session_analytics(project_id, start, end, steps).funnel())
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlmodel import Session, select
+
+from ..config import get_settings
+from ..models import AlertKind, AlertRule, EventRead, EventType, is_http_url, to_epoch
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowCounter:
+    """Ring of time slots counting events in the current window and its history.
+
+    ``add`` and the window reads are amortised O(1): advancing the clock only touches
+    the slots that expired since the previous call.
+    """
+
+    def __init__(self, window_seconds: float, history_windows: int = 0, slots_per_window: int = 60) -> None:
+        self.slots_per_window = slots_per_window
+        self.history_windows = history_windows
+        self.slot_seconds = window_seconds / slots_per_window
+        self._slots = [0] * (slots_per_window * (history_windows + 1))
+        self._head: Optional[int] = None
+        self._first: Optional[int] = None
+        self._recent = 0
+        self._total = 0
+
+    def _advance(self, now: float) -> None:
+        slot = int(now // self.slot_seconds)
+        size = len(self._slots)
+        if self._head is None or slot - self._head >= size:
+            self._slots = [0] * size
+            self._recent = self._total = 0
+            self._first = slot if self._head is None else self._first
+            self._head = slot
+            return
+        while self._head < slot:
+            self._head += 1
+            self._recent -= self._slots[(self._head - self.slots_per_window) % size]
+            index = self._head % size
+            self._total -= self._slots[index]
+            self._slots[index] = 0
+
+    def add(self, now: float, count: int = 1) -> None:
+        self._advance(now)
+        self._slots[self._head % len(self._slots)] += count
+        self._recent += count
+        self._total += count
+
+    def current(self, now: float) -> int:
+        self._advance(now)
+        return self._recent
+
+    def baseline(self, now: float) -> Optional[float]:
+        """Average count per window over the observed history, once a full window exists."""
+
+        self._advance(now)
+        if not self.history_windows or self._first is None:
+            return None
+        observed = min(len(self._slots), self._head - self._first + 1) - self.slots_per_window
+        if observed < self.slots_per_window:
+            return None
+        return (self._total - self._recent) * self.slots_per_window / observed
+
+    def checkpoint(self) -> Dict[str, Any]:
+        return {
+            "slot_seconds": self.slot_seconds,
+            "head": self._head,
+            "first": self._first,
+            "slots": list(self._slots),
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        if state.get("slot_seconds") != self.slot_seconds or len(state.get("slots", ())) != len(self._slots):
+            return
+        self._slots = list(state["slots"])
+        self._head = state["head"]
+        self._first = state["first"]
+        self._total = sum(self._slots)
+        if self._head is not None:
+            size = len(self._slots)
+            self._recent = sum(
+                self._slots[(self._head - offset) % size] for offset in range(self.slots_per_window)
+            )
+
+
+class _RuleState:
+    def __init__(self, rule: AlertRule) -> None:
+        self.rule_id = rule.id
+        self.project_id = rule.project_id
+        self.refresh(rule)
+        self.shape = _counter_shape(rule)
+        history = rule.baseline_windows if self.kind == AlertKind.RATE_CHANGE else 0
+        self.counter = SlidingWindowCounter(rule.window_seconds, history)
+        if rule.counter_state:
+            self.counter.restore(rule.counter_state)
+        self.last_fired: Optional[float] = to_epoch(rule.last_fired_at) if rule.last_fired_at else None
+
+    def refresh(self, rule: AlertRule) -> None:
+        """Apply settings that do not change the shape of the counter."""
+
+        self.name = rule.name
+        self.kind = AlertKind(rule.kind)
+        self.event_type = EventType(rule.event_type) if rule.event_type else None
+        self.threshold = rule.threshold
+        self.min_events = rule.min_events
+        self.cooldown_seconds = rule.cooldown_seconds
+        self.webhook_url = rule.webhook_url
+
+    def matches(self, event_type: EventType) -> bool:
+        return self.event_type is None or self.event_type == event_type
+
+    def should_fire(self, now: float) -> bool:
+        if self.last_fired is not None and now - self.last_fired < self.cooldown_seconds:
+            return False
+        count = self.counter.current(now)
+        if self.kind == AlertKind.THRESHOLD:
+            return count > self.threshold
+        baseline = self.counter.baseline(now)
+        if baseline is None or count < self.min_events:
+            return False
+        return count > self.threshold * baseline
+
+
+class AlertEngine:
+    """Evaluates per-project alert rules incrementally as events are recorded.
+
+    Rules are cached per process and reloaded every ``alert_rules_refresh_seconds``,
+    so rule changes made through another worker are picked up after that delay.
+    Counters are also per process: run a single worker when alerts are in use,
+    otherwise each worker only counts its own events and the workers overwrite each
+    other's checkpoints.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self.clock = clock
+        self._rules: Dict[int, List[_RuleState]] = {}
+        self._loaded_at: Dict[int, float] = {}
+        self._last_checkpoint: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def _rules_for(self, session: Session, project_id: int) -> List[_RuleState]:
+        states = self._rules.get(project_id)
+        now = self.clock()
+        loaded_at = self._loaded_at.get(project_id)
+        if states is not None and loaded_at is not None:
+            if now - loaded_at < get_settings().alert_rules_refresh_seconds:
+                return states
+        rules = session.exec(select(AlertRule).where(AlertRule.project_id == project_id)).all()
+        with self._lock:
+            # Keep live counters for rules whose window layout is unchanged.
+            existing = {state.rule_id: state for state in self._rules.get(project_id, ())}
+            states = []
+            for rule in rules:
+                state = existing.get(rule.id)
+                if state is not None and state.shape == _counter_shape(rule):
+                    state.refresh(rule)
+                else:
+                    state = _RuleState(rule)
+                states.append(state)
+            self._rules[project_id] = states
+            self._loaded_at[project_id] = now
+            self._last_checkpoint.setdefault(project_id, now)
+        return states
+
+    def observe(self, session: Session, event: EventRead) -> None:
+        states = self._rules_for(session, event.project_id)
+        if not states:
+            return
+        now = self.clock()
+        fired: List[Dict[str, Any]] = []
+        with self._lock:
+            for state in states:
+                if not state.matches(event.event_type):
+                    continue
+                state.counter.add(now)
+                if state.should_fire(now):
+                    state.last_fired = now
+                    fired.append(self._alert_payload(state, now))
+        for alert in fired:
+            self._dispatch(alert)
+        interval = get_settings().alert_checkpoint_seconds
+        if fired or now - self._last_checkpoint.get(event.project_id, now) >= interval:
+            self.checkpoint(session, event.project_id)
+
+    def status(self, session: Session, rule: AlertRule) -> Dict[str, Any]:
+        """Return the live counter values for ``rule``."""
+
+        now = self.clock()
+        for state in self._rules_for(session, rule.project_id):
+            if state.rule_id == rule.id:
+                with self._lock:
+                    return {"current_count": state.counter.current(now), "baseline": state.counter.baseline(now)}
+        return {"current_count": 0, "baseline": None}
+
+    def checkpoint(self, session: Session, project_id: int) -> None:
+        """Persist counters and firing times so a restart resumes the windows."""
+
+        with self._lock:
+            snapshot = [
+                (state.rule_id, state.counter.checkpoint(), state.last_fired)
+                for state in self._rules.get(project_id, ())
+            ]
+            self._last_checkpoint[project_id] = self.clock()
+        for rule_id, counter_state, last_fired in snapshot:
+            rule = session.get(AlertRule, rule_id)
+            if rule is None:
+                continue
+            rule.counter_state = counter_state
+            rule.last_fired_at = _utc_datetime(last_fired) if last_fired else None
+            session.add(rule)
+        session.commit()
+
+    def invalidate(self, project_id: int) -> None:
+        """Reload the project's rules on next use, keeping counters of unchanged rules."""
+
+        with self._lock:
+            self._loaded_at.pop(project_id, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._rules.clear()
+            self._loaded_at.clear()
+            self._last_checkpoint.clear()
+
+    def _alert_payload(self, state: _RuleState, now: float) -> Dict[str, Any]:
+        return {
+            "rule_id": state.rule_id,
+            "project_id": state.project_id,
+            "name": state.name,
+            "kind": state.kind.value,
+            "count": state.counter.current(now),
+            "baseline": state.counter.baseline(now),
+            "threshold": state.threshold,
+            "fired_at": _utc_datetime(now).isoformat(),
+            "webhook_url": state.webhook_url,
+        }
+
+    def _dispatch(self, alert: Dict[str, Any]) -> None:
+        logger.warning("Alert %r fired for project %s: %s", alert["name"], alert["project_id"], alert)
+        webhook_url = alert.pop("webhook_url")
+        if webhook_url:
+            threading.Thread(target=_post_webhook, args=(webhook_url, alert), daemon=True).start()
+
+
+def _counter_shape(rule: AlertRule) -> tuple:
+    return (AlertKind(rule.kind), rule.window_seconds, rule.baseline_windows)
+
+
+def _utc_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def _post_webhook(url: str, alert: Dict[str, Any]) -> None:
+    if not is_http_url(url):
+        logger.error("Refusing to deliver alert %r to non-HTTP URL %s", alert["name"], url)
+        return
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(alert).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5):
+            pass
+    except OSError:
+        logger.exception("Could not deliver alert %r to %s", alert["name"], url)
+
+
+alert_engine = AlertEngine()
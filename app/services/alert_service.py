@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+
+from ..models import AlertRule, AlertRuleCreate, AlertRuleRead
+from .alert_engine import alert_engine
+
+
+class AlertService:
+    """Service layer for managing per-project alert rules."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def _to_read(self, rule: AlertRule) -> AlertRuleRead:
+        return AlertRuleRead(**rule.dict(exclude={"counter_state"}), **alert_engine.status(self.session, rule))
+
+    def create_rule(self, project_id: int, payload: AlertRuleCreate) -> AlertRuleRead:
+        rule = AlertRule(**payload.dict(), project_id=project_id)
+        self.session.add(rule)
+        self.session.commit()
+        self.session.refresh(rule)
+        alert_engine.invalidate(project_id)
+        return self._to_read(rule)
+
+    def list_rules(self, project_id: int) -> List[AlertRuleRead]:
+        statement = select(AlertRule).where(AlertRule.project_id == project_id).order_by(AlertRule.id)
+        return [self._to_read(rule) for rule in self.session.exec(statement).all()]
+
+    def get_rule(self, rule_id: int) -> AlertRule:
+        rule = self.session.get(AlertRule, rule_id)
+        if not rule:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Alert rule not found")
+        return rule
+
+    def delete_rule(self, rule_id: int) -> None:
+        rule = self.get_rule(rule_id)
+        project_id = rule.project_id
+        self.session.delete(rule)
+        self.session.commit()
+        alert_engine.invalidate(project_id)
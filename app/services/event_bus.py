@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from ..models import EventQueryParams, EventRead, to_naive_utc
+from ..utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Bounded per-subscriber buffer fed by :class:`EventBus`.
+
+    When the buffer is full the oldest message is discarded and counted in
+    ``dropped`` so a slow consumer never blocks publishers.
+    """
+
+    def __init__(self, project_id: int, filters: EventQueryParams, max_buffer: int) -> None:
+        self.project_id = project_id
+        # Stored timestamps are naive UTC; aware bounds would not compare with them.
+        self.filters = filters.copy(
+            update={
+                "occurred_from": to_naive_utc(filters.occurred_from),
+                "occurred_to": to_naive_utc(filters.occurred_to),
+            }
+        )
+        self.max_buffer = max(1, max_buffer)
+        self.dropped = 0
+        self._buffer: Deque[Tuple[int, bytes]] = deque()
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def matches(self, event: EventRead) -> bool:
+        filters = self.filters
+        if filters.event_type and event.event_type != filters.event_type:
+            return False
+        for field in ("user_id", "session_id", "environment", "release"):
+            expected = getattr(filters, field)
+            if expected and getattr(event, field) != expected:
+                return False
+        if filters.occurred_from and event.occurred_at < filters.occurred_from:
+            return False
+        if filters.occurred_to and event.occurred_at > filters.occurred_to:
+            return False
+        if filters.search:
+            needle = filters.search.lower()
+            haystacks = (event.name, event.message, event.page_url)
+            if not any(value and needle in value.lower() for value in haystacks):
+                return False
+        return True
+
+    def offer(self, event_id: int, data: bytes) -> None:
+        """Enqueue a serialized event; safe to call from any thread."""
+
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append((event_id, data))
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:  # pragma: no cover - subscriber loop already closed
+            pass
+
+    async def get(self, timeout: Optional[float] = None) -> Tuple[List[Tuple[int, bytes]], int]:
+        """Wait for buffered events and return them with the number dropped since last call."""
+
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._lock:
+            self._ready.clear()
+            items = list(self._buffer)
+            self._buffer.clear()
+            dropped, self.dropped = self.dropped, 0
+        return items, dropped
+
+
+class EventBus:
+    """In-process publish/subscribe hub for newly recorded events."""
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, project_id: int, filters: EventQueryParams, max_buffer: int) -> Subscription:
+        subscription = Subscription(project_id, filters, max_buffer)
+        with self._lock:
+            self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+    def publish(self, event: EventRead) -> None:
+        """Offer ``event`` to matching subscribers; a failing subscriber is logged and skipped."""
+
+        subscribers = self._subscribers.get(event.project_id)
+        if not subscribers:
+            return
+        with self._lock:
+            subscribers = list(subscribers)
+        data: Optional[bytes] = None
+        for subscription in subscribers:
+            try:
+                if subscription.matches(event):
+                    if data is None:
+                        data = dumps(event.dict())
+                    subscription.offer(event.id, data)
+            except Exception:
+                logger.exception("Could not publish event %s to a live-tail subscriber", event.id)
+
+
+event_bus = EventBus()
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Dict, List, Optional
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from fastapi import HTTPException
-from sqlalchemy import func, or_, select
-from sqlmodel import Session
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy import select as sa_select
+from sqlmodel import Session, select
 
-from ..models import Event, EventCreate, EventQueryParams, EventRead, EventType, Project
+from ..config import get_settings
+from ..models import Event, EventCreate, EventQueryParams, EventRead, EventType, Project, to_epoch, to_naive_utc
+from .alert_engine import alert_engine
+from .event_bus import event_bus
+from .idempotency import idempotency_guard
+from .session_analytics import SessionAnalytics
+
+# Columns fetched by the list fast path, in ``EventRead`` field order so that the
+# serialized output matches the schema-driven response byte for byte.
+_EVENT_READ_FIELDS = tuple(EventRead.__fields__)
+_EVENT_READ_COLUMNS = tuple(Event.__table__.c[name] for name in _EVENT_READ_FIELDS)
+
+_GRANULARITY_PATTERN = re.compile(r"(\d+)([mhdw])")
+_GRANULARITY_ALIASES = {"minute": "1m", "hour": "1h", "day": "1d", "week": "1w"}
+_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+# The epoch started on a Thursday; shift weekly buckets so they begin on Monday.
+_WEEK_OFFSET = 4 * 86400
+_OVERVIEW_SORT_KEYS = {"total_events", "unique_users", "latest_event", "name"}
+_SESSION_SCAN_BATCH_SIZE = 1000
 
 
 class EventService:
@@ -16,13 +36,48 @@ class EventService:
     def __init__(self, session: Session) -> None:
         self.session = session
 
-    def record_event(self, project: Project, payload: EventCreate) -> EventRead:
-        event = Event.from_orm(payload)
-        event.project_id = project.id
+    def record_event(
+        self, project: Project, payload: EventCreate, idempotency_key: Optional[str] = None
+    ) -> EventRead:
+        event = Event(**payload.dict(), project_id=project.id, idempotency_key=idempotency_key)
         self.session.add(event)
         self.session.commit()
         self.session.refresh(event)
-        return EventRead.from_orm(event)
+        if idempotency_key:
+            self._idempotency_filter(project.id).add(idempotency_key)
+        event_read = EventRead.from_orm(event)
+        event_bus.publish(event_read)
+        alert_engine.observe(self.session, event_read)
+        return event_read
+
+    def find_duplicate(self, project_id: int, idempotency_key: str) -> Optional[EventRead]:
+        """Return the event previously stored under ``idempotency_key`` within the window.
+
+        The database is only consulted when the project's Bloom filter reports a
+        possible hit, so first-time keys cost no query.
+        """
+
+        if idempotency_key not in self._idempotency_filter(project_id):
+            return None
+        window = timedelta(seconds=get_settings().idempotency_window_seconds)
+        statement = select(Event).where(
+            Event.project_id == project_id,
+            Event.idempotency_key == idempotency_key,
+            Event.received_at >= datetime.utcnow() - window,
+        )
+        event = self.session.exec(statement).first()
+        return EventRead.from_orm(event) if event else None
+
+    def _idempotency_filter(self, project_id: int):
+        def load_recent(window_seconds: float):
+            statement = select(Event.idempotency_key).where(
+                Event.project_id == project_id,
+                Event.idempotency_key.isnot(None),
+                Event.received_at >= datetime.utcnow() - timedelta(seconds=window_seconds),
+            )
+            return self.session.exec(statement).all()
+
+        return idempotency_guard.filter_for(project_id, load_recent)
 
     def _build_filters(self, project_id: int, params: EventQueryParams):
         filters = [Event.project_id == project_id]
@@ -52,16 +107,22 @@ class EventService:
         return filters
 
     def list_events(self, project_id: int, params: EventQueryParams) -> Dict[str, object]:
+        """Return a page of events as plain dictionaries shaped like ``EventRead``.
+
+        Only the columns are selected, so rows never enter the session identity map and
+        no ORM or pydantic objects are built for them.
+        """
+
         filters = self._build_filters(project_id, params)
-        base_query = select(Event).where(*filters).order_by(Event.occurred_at.desc())
+        base_query = (
+            sa_select(*_EVENT_READ_COLUMNS).where(*filters).order_by(Event.occurred_at.desc())
+        )
         count_statement = select(func.count(Event.id)).where(*filters)
         total = self.session.exec(count_statement).one()
         page_size = max(1, min(params.page_size, 200))
         page = max(1, params.page)
-        events = (
-            self.session.exec(base_query.offset((page - 1) * page_size).limit(page_size)).all()
-        )
-        items = [EventRead.from_orm(event) for event in events]
+        rows = self.session.execute(base_query.offset((page - 1) * page_size).limit(page_size))
+        items = [dict(zip(_EVENT_READ_FIELDS, row)) for row in rows]
         return {
             "items": items,
             "total": total,
@@ -69,14 +130,20 @@ class EventService:
             "page_size": page_size,
         }
 
-    def _aggregate_counts(
-        self, project_id: int, start: Optional[datetime], end: Optional[datetime]
-    ) -> Dict[str, int]:
+    def _window_filters(self, project_id: int, start: Optional[datetime], end: Optional[datetime]) -> list:
+        """Filters for events in ``[start, end]``; aware bounds are compared as naive UTC."""
+
         filters = [Event.project_id == project_id]
         if start:
-            filters.append(Event.occurred_at >= start)
+            filters.append(Event.occurred_at >= to_naive_utc(start))
         if end:
-            filters.append(Event.occurred_at <= end)
+            filters.append(Event.occurred_at <= to_naive_utc(end))
+        return filters
+
+    def _aggregate_counts(
+        self, project_id: int, start: Optional[datetime], end: Optional[datetime]
+    ) -> Dict[str, int]:
+        filters = self._window_filters(project_id, start, end)
         statement = (
             select(Event.event_type, func.count(Event.id))
             .where(*filters)
@@ -89,11 +156,7 @@ class EventService:
         }
 
     def summary(self, project_id: int, start: Optional[datetime], end: Optional[datetime]) -> Dict[str, object]:
-        filters = [Event.project_id == project_id]
-        if start:
-            filters.append(Event.occurred_at >= start)
-        if end:
-            filters.append(Event.occurred_at <= end)
+        filters = self._window_filters(project_id, start, end)
 
         total_statement = select(func.count(Event.id)).where(*filters)
         total_events = self.session.exec(total_statement).one()
@@ -115,6 +178,97 @@ class EventService:
             "counts_by_type": counts,
         }
 
+    def overview(
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        page: int = 1,
+        page_size: int = 50,
+        sort_by: str = "total_events",
+        descending: bool = True,
+    ) -> Dict[str, object]:
+        """Summarise many projects with a single grouped query.
+
+        Event filters live in the join condition so projects without events in the
+        window are still listed with zero counts.
+        """
+
+        if sort_by not in _OVERVIEW_SORT_KEYS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sort key")
+
+        join_conditions = [Event.project_id == Project.id]
+        if start:
+            join_conditions.append(Event.occurred_ts >= to_epoch(start))
+        if end:
+            join_conditions.append(Event.occurred_ts <= to_epoch(end))
+
+        total_events = func.count(Event.id).label("total_events")
+        unique_users = func.count(func.distinct(Event.user_id)).label("unique_users")
+        latest_event = func.max(Event.occurred_at).label("latest_event")
+        type_counts = [
+            func.sum(case((Event.event_type == event_type, 1), else_=0)) for event_type in EventType
+        ]
+        sort_column = {
+            "total_events": total_events,
+            "unique_users": unique_users,
+            "latest_event": latest_event,
+            "name": Project.name,
+        }[sort_by]
+        page_size = max(1, min(page_size, 200))
+        page = max(1, page)
+
+        statement = (
+            select(Project.id, Project.name, total_events, unique_users, latest_event, *type_counts)
+            .outerjoin(Event, and_(*join_conditions))
+            .group_by(Project.id, Project.name)
+            .order_by(sort_column.desc() if descending else sort_column.asc(), Project.id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        rows = self.session.exec(statement).all()
+        total = self.session.exec(select(func.count(Project.id))).one()
+
+        items = []
+        for project_id, name, total_count, users, latest, *counts in rows:
+            items.append(
+                {
+                    "project_id": project_id,
+                    "name": name,
+                    "total_events": total_count,
+                    "unique_users": users,
+                    "latest_event": latest,
+                    "counts_by_type": {
+                        event_type.value: count or 0 for event_type, count in zip(EventType, counts)
+                    },
+                }
+            )
+        return {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "start": start,
+            "end": end,
+        }
+
+    def session_analytics(
+        self,
+        project_id: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        funnel_steps: Sequence[str] = (),
+    ) -> SessionAnalytics:
+        """Stream the window's events once, ordered through the session index."""
+
+        filters = [*self._window_filters(project_id, start, end), Event.session_id.isnot(None)]
+        statement = (
+            sa_select(Event.session_id, Event.occurred_at, Event.name, Event.page_url)
+            .where(*filters)
+            .order_by(Event.session_id, Event.occurred_at)
+            .execution_options(yield_per=_SESSION_SCAN_BATCH_SIZE)
+        )
+        return SessionAnalytics(funnel_steps).consume(self.session.execute(statement))
+
     def timeseries(
         self,
         project_id: int,
@@ -122,29 +276,49 @@ class EventService:
         end: Optional[datetime],
         granularity: str = "day",
     ) -> List[Dict[str, object]]:
-        if granularity not in {"hour", "day"}:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid granularity")
+        """Return per-type counts bucketed by ``granularity``, including empty buckets.
 
-        if granularity == "hour":
-            bucket = func.strftime("%Y-%m-%d %H:00:00", Event.occurred_at)
-        else:
-            bucket = func.strftime("%Y-%m-%d", Event.occurred_at)
+        Without ``start`` or ``end`` the range covers the data, limited to the latest
+        ``timeseries_max_points`` buckets. Buckets are computed with integer arithmetic on ``occurred_ts`` so the range
+        filter can use the ``(project_id, occurred_ts)`` index on any backend.
+        """
 
+        interval, offset = _parse_granularity(granularity)
+        max_points = get_settings().timeseries_max_points
+        start_ts = to_epoch(start) if start else None
+        end_ts = to_epoch(end) if end else None
         filters = [Event.project_id == project_id]
-        if start:
-            filters.append(Event.occurred_at >= start)
-        if end:
-            filters.append(Event.occurred_at <= end)
+        if start_ts is not None:
+            filters.append(Event.occurred_ts >= start_ts)
+        if end_ts is not None:
+            filters.append(Event.occurred_ts <= end_ts)
+
+        if start_ts is not None and end_ts is not None:
+            _check_points(start_ts, end_ts, interval, offset, max_points)
+        else:
+            # Open-ended ranges are resolved from the data and clamped to the most
+            # recent ``max_points`` buckets; single min()/max() lookups use the index.
+            if end_ts is None:
+                end_ts = self.session.exec(select(func.max(Event.occurred_ts)).where(*filters)).one()
+                if end_ts is None:
+                    return []
+            if start_ts is None:
+                start_ts = self.session.exec(select(func.min(Event.occurred_ts)).where(*filters)).one()
+            earliest = _align(end_ts, interval, offset) - (max_points - 1) * interval
+            start_ts = max(start_ts, earliest)
+            filters = [Event.project_id == project_id, Event.occurred_ts.between(start_ts, end_ts)]
+        if end_ts < start_ts:
+            return []
 
+        bucket = (Event.occurred_ts - (Event.occurred_ts - offset) % interval).label("bucket")
         statement = (
-            select(bucket.label("bucket"), Event.event_type, func.count(Event.id).label("count"))
+            select(bucket, Event.event_type, func.count(Event.id).label("count"))
             .where(*filters)
             .group_by("bucket", Event.event_type)
-            .order_by("bucket")
         )
 
         rows = self.session.exec(statement).all()
-        aggregated: Dict[str, Dict[str, int]] = {}
+        aggregated: Dict[int, Dict[str, int]] = {}
         for bucket_value, event_type, count in rows:
             bucket_counts = aggregated.setdefault(
                 bucket_value,
@@ -154,7 +328,37 @@ class EventService:
             bucket_counts[key] = count
 
         output: List[Dict[str, object]] = []
-        for bucket_value, counts in aggregated.items():
-            total = sum(counts.values())
-            output.append({"bucket": bucket_value, "counts": counts, "total": total})
+        first = _align(start_ts, interval, offset)
+        for bucket_value in range(first, _align(end_ts, interval, offset) + 1, interval):
+            counts = aggregated.get(bucket_value) or {et.value: 0 for et in EventType}
+            output.append(
+                {
+                    "bucket": datetime.fromtimestamp(bucket_value, timezone.utc).replace(tzinfo=None),
+                    "counts": counts,
+                    "total": sum(counts.values()),
+                }
+            )
         return output
+
+
+def _parse_granularity(granularity: str) -> Tuple[int, int]:
+    """Translate ``granularity`` into an ``(interval, offset)`` pair in seconds."""
+
+    match = _GRANULARITY_PATTERN.fullmatch(_GRANULARITY_ALIASES.get(granularity, granularity))
+    if not match or int(match.group(1)) == 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid granularity")
+    unit = match.group(2)
+    return int(match.group(1)) * _UNIT_SECONDS[unit], _WEEK_OFFSET if unit == "w" else 0
+
+
+def _align(timestamp: int, interval: int, offset: int) -> int:
+    return timestamp - (timestamp - offset) % interval
+
+
+def _check_points(start_ts: int, end_ts: int, interval: int, offset: int, max_points: int) -> None:
+    points = (_align(end_ts, interval, offset) - _align(start_ts, interval, offset)) // interval + 1
+    if points > max_points:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Requested range spans {points} buckets; the maximum is {max_points}",
+        )
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from ..config import get_settings
+from ..models import EventCreate
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class WindowedBloomFilter:
+    """Pair of rotating Bloom filters remembering keys for at least ``window_seconds``."""
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous: Optional[BloomFilter] = None
+        self._started = clock()
+        self._lock = threading.Lock()
+
+    def _rotate(self) -> None:
+        elapsed = self._clock() - self._started
+        if elapsed < self.window_seconds:
+            return
+        self._previous = self._current if elapsed < 2 * self.window_seconds else None
+        self._current = BloomFilter(self.capacity, self.error_rate)
+        self._started = self._clock()
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            self._rotate()
+            self._current.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._rotate()
+            return key in self._current or (self._previous is not None and key in self._previous)
+
+
+class IdempotencyGuard:
+    """Per-project registry of windowed Bloom filters for recently seen idempotency keys.
+
+    Filters live in process memory and are warmed from the database once per worker.
+    With several workers a retry handled by a different worker than the original may
+    miss that worker's filter and be stored again, and two concurrent first attempts
+    can both be stored because the hot path avoids a unique index.
+    """
+
+    def __init__(self) -> None:
+        self._filters: Dict[int, WindowedBloomFilter] = {}
+        self._lock = threading.Lock()
+
+    def filter_for(
+        self, project_id: int, load_recent: Callable[[float], Iterable[str]]
+    ) -> WindowedBloomFilter:
+        """Return the project's filter, warming it from ``load_recent`` on first use."""
+
+        bloom = self._filters.get(project_id)
+        if bloom is not None:
+            return bloom
+        with self._lock:
+            bloom = self._filters.get(project_id)
+            if bloom is None:
+                settings = get_settings()
+                bloom = WindowedBloomFilter(
+                    settings.idempotency_bloom_capacity,
+                    settings.idempotency_bloom_error_rate,
+                    settings.idempotency_window_seconds,
+                )
+                for key in load_recent(settings.idempotency_window_seconds):
+                    bloom.add(key)
+                self._filters[project_id] = bloom
+        return bloom
+
+
+def derive_idempotency_key(payload: EventCreate) -> Optional[str]:
+    """Hash the fields the client sent into a key for requests without an explicit one.
+
+    Disabled unless ``idempotency_derive_keys`` is set: identical events sent on
+    purpose would otherwise be discarded as retries. Only events carrying a
+    client-side ``occurred_at`` are keyed.
+    """
+
+    if not get_settings().idempotency_derive_keys:
+        return None
+    sent = payload.dict(exclude_unset=True)
+    if "occurred_at" not in sent:
+        return None
+    canonical = json.dumps(sent, sort_keys=True, separators=(",", ":"), default=str)
+    return "derived:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+idempotency_guard = IdempotencyGuard()
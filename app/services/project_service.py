@@ -20,8 +20,7 @@ class ProjectService:
         return token_urlsafe(32)
 
     def create_project(self, payload: ProjectCreate) -> ProjectRead:
-        project = Project.from_orm(payload)
-        project.api_key = self._generate_api_key()
+        project = Project(**payload.dict(), api_key=self._generate_api_key())
         self.session.add(project)
         self.session.commit()
         self.session.refresh(project)
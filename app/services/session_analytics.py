@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+SessionRow = Tuple[str, datetime, str, Optional[str]]
+
+
+class SessionAnalytics:
+    """Single-pass fold over events ordered by ``(session_id, occurred_at)``.
+
+    Only the session currently being read is tracked, so memory stays constant no
+    matter how many sessions or events the window contains.
+    """
+
+    def __init__(self, funnel_steps: Sequence[str] = ()) -> None:
+        self.funnel_steps = list(funnel_steps)
+        self.sessions = 0
+        self.events = 0
+        self.bounces = 0
+        self.total_duration = 0.0
+        self.longest_duration = 0.0
+        self.reached = [0] * len(self.funnel_steps)
+
+        self._session_id: Optional[str] = None
+        self._first_seen: Optional[datetime] = None
+        self._last_seen: Optional[datetime] = None
+        self._landing_page: Optional[str] = None
+        self._left_landing_page = False
+        self._step = 0
+
+    def consume(self, rows: Iterable[SessionRow]) -> "SessionAnalytics":
+        for session_id, occurred_at, name, page_url in rows:
+            if session_id != self._session_id:
+                self._finish_session()
+                self._session_id = session_id
+                self._first_seen = occurred_at
+                self._landing_page = page_url
+                self._left_landing_page = False
+                self._step = 0
+            self.events += 1
+            self._last_seen = occurred_at
+            if page_url != self._landing_page:
+                self._left_landing_page = True
+            if self._step < len(self.funnel_steps) and name == self.funnel_steps[self._step]:
+                self.reached[self._step] += 1
+                self._step += 1
+        self._finish_session()
+        return self
+
+    def _finish_session(self) -> None:
+        if self._session_id is None:
+            return
+        self.sessions += 1
+        duration = (self._last_seen - self._first_seen).total_seconds()
+        self.total_duration += duration
+        self.longest_duration = max(self.longest_duration, duration)
+        if not self._left_landing_page:
+            self.bounces += 1
+        self._session_id = None
+
+    def session_summary(self) -> Dict[str, object]:
+        return {
+            "sessions": self.sessions,
+            "events": self.events,
+            "avg_duration_seconds": self.total_duration / self.sessions if self.sessions else 0.0,
+            "max_duration_seconds": self.longest_duration,
+            "avg_events_per_session": self.events / self.sessions if self.sessions else 0.0,
+            "bounces": self.bounces,
+            "bounce_rate": self.bounces / self.sessions if self.sessions else 0.0,
+        }
+
+    def funnel(self) -> Dict[str, object]:
+        steps: List[Dict[str, object]] = []
+        previous = self.sessions
+        entered = self.reached[0] if self.reached else 0
+        for name, count in zip(self.funnel_steps, self.reached):
+            steps.append(
+                {
+                    "name": name,
+                    "sessions": count,
+                    "conversion_from_previous": count / previous if previous else 0.0,
+                    "conversion_from_start": count / entered if entered else 0.0,
+                }
+            )
+            previous = count
+        return {"sessions": self.sessions, "steps": steps}
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Query-Profile"
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    parameters: Any
+    engine: Engine
+    executemany: bool
+    duration_ms: float = 0.0
+    rows: Optional[int] = None
+
+
+@dataclass
+class QueryProfile:
+    """Statements executed while handling a single request."""
+
+    method: str
+    path: str
+    queries: List[QueryRecord] = field(default_factory=list)
+    context: Dict[str, Any] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        total = sum(query.duration_ms for query in self.queries)
+        slowest = max((query.duration_ms for query in self.queries), default=0.0)
+        rows = sum(query.rows or 0 for query in self.queries)
+        return f"queries={len(self.queries)}; total_ms={total:.3f}; slowest_ms={slowest:.3f}; rows={rows}"
+
+
+def annotate(**values: Any) -> None:
+    """Attach request details (e.g. the active filters) to the current profile, if any."""
+
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.context.update(values)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    record = QueryRecord(statement, parameters, conn.engine, executemany)
+    profile.queries.append(record)
+    # Kept on the execution context, which is discarded with the statement even when
+    # it fails, so nothing outlives the statement on the pooled connection.
+    context._query_profile_started = (record, time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_query_profile_started", None)
+    if started is None:
+        return
+    del context._query_profile_started
+    record, start = started
+    record.duration_ms = (time.perf_counter() - start) * 1000
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        record.rows = cursor.rowcount
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(orm_execute_state):
+    """Fetch results eagerly while profiling so row counts and fetch time are measured.
+
+    Streaming queries are left alone; they are timed at the cursor level only.
+    """
+
+    profile = _current_profile.get()
+    if profile is None or not orm_execute_state.is_select:
+        return None
+    options = orm_execute_state.execution_options
+    if options.get("yield_per") or options.get("stream_results"):
+        return None  # leave streaming queries unbuffered
+    first = len(profile.queries)
+    start = time.perf_counter()
+    result = orm_execute_state.invoke_statement()
+    frozen = result.freeze()
+    if len(profile.queries) > first:
+        record = profile.queries[-1]
+        record.duration_ms = (time.perf_counter() - start) * 1000
+        record.rows = len(frozen.data)
+    return frozen()
+
+
+def _query_plan(record: QueryRecord) -> Optional[List[str]]:
+    if record.executemany or record.engine.dialect.name != "sqlite":
+        return None
+    if not record.statement.lstrip().upper().startswith("SELECT"):
+        return None
+    try:
+        with record.engine.connect() as conn:
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + record.statement, record.parameters).all()
+    except SQLAlchemyError:  # pragma: no cover - the plan is best effort
+        logger.exception("Could not explain slow query")
+        return None
+    return [row[-1] for row in rows]
+
+
+def write_slow_queries(profile: QueryProfile) -> None:
+    """Append statements slower than the configured threshold to the slow query log.
+
+    Bound parameters are only used to explain the statement and are never written,
+    so filter values such as user identifiers stay out of the log.
+    """
+
+    settings = get_settings()
+    if not settings.slow_query_log_path:
+        return
+    slow = [query for query in profile.queries if query.duration_ms >= settings.slow_query_threshold_ms]
+    if not slow:
+        return
+    with open(settings.slow_query_log_path, "a", encoding="utf-8") as log_file:
+        for query in slow:
+            entry = {
+                "recorded_at": datetime.utcnow().isoformat(),
+                "method": profile.method,
+                "path": profile.path,
+                "duration_ms": round(query.duration_ms, 3),
+                "rows": query.rows,
+                "statement": query.statement,
+                "plan": _query_plan(query),
+                "context": profile.context,
+            }
+            logger.warning("Slow query (%.1f ms) on %s: %s", query.duration_ms, profile.path, query.statement)
+            log_file.write(json.dumps(entry, default=str) + "\n")
+
+
+class QueryProfilingMiddleware:
+    """Record the SQL executed per request.
+
+    Profiling is enabled by the ``query_profiling`` setting or an ``X-Query-Profile``
+    request header, and reports its summary in the same response header. When a slow
+    query log is configured every request is recorded so slow statements are captured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        settings = get_settings()
+        header = Headers(scope=scope).get(PROFILE_HEADER, "")
+        report = settings.query_profiling or header.lower() in {"1", "true", "yes"}
+        if not report and not settings.slow_query_log_path:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(method=scope["method"], path=scope["path"])
+
+        async def send_with_profile(message: Message) -> None:
+            if report and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(PROFILE_HEADER, profile.summary())
+                total = sum(query.duration_ms for query in profile.queries)
+                headers.append("Server-Timing", f'db;dur={total:.3f};desc="{len(profile.queries)} queries"')
+            await send(message)
+
+        token = _current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current_profile.reset(token)
+            await run_in_threadpool(write_slow_queries, profile)
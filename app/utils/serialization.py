@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from fastapi import Response
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain Python data exactly as FastAPI's default ``JSONResponse`` would.
+
+    The separators and flags mirror ``starlette.responses.JSONResponse.render`` so the
+    bytes match the regular response path, while skipping ``jsonable_encoder``.
+    """
+
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """Return pre-rendered JSON, bypassing response model validation and encoding."""
+
+    return Response(content=dumps(content), status_code=status_code, media_type="application/json")
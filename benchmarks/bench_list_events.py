@@ -0,0 +1,85 @@
+"""Compare the ORM-based and column-tuple serialization paths for ``list_events``.
+
+Run with ``python -m benchmarks.bench_list_events`` from the repository root.
+"""
+
+from __future__ import annotations
+
+import timeit
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.models import Event, EventQueryParams, EventRead, EventType, Project
+from app.services.event_service import EventService
+from app.utils.serialization import dumps
+
+ROWS = 200
+REPEAT = 50
+
+
+def _seed(engine) -> int:
+    with Session(engine) as session:
+        project = Project(name="bench", api_key="bench")
+        session.add(project)
+        session.commit()
+        session.refresh(project)
+        now = datetime.utcnow()
+        payload = {
+            "breadcrumbs": [{"category": "ui.click", "message": f"button#{i}", "level": "info"} for i in range(20)],
+            "tags": {f"tag_{i}": f"value_{i}" for i in range(20)},
+            "metrics": {"ttfb": 123.4, "fcp": 456.7, "lcp": 890.1},
+        }
+        for index in range(ROWS):
+            session.add(
+                Event(
+                    project_id=project.id,
+                    event_type=EventType.ERROR,
+                    name=f"TypeError {index}",
+                    message="Cannot read properties of undefined",
+                    payload=payload,
+                    user_id=f"user-{index % 17}",
+                    session_id=f"session-{index % 5}",
+                    page_url="https://app.example.com/dashboard",
+                    occurred_at=now - timedelta(seconds=index),
+                )
+            )
+        session.commit()
+        return project.id
+
+
+def _orm_path(engine, project_id: int) -> bytes:
+    with Session(engine) as session:
+        filters = [Event.project_id == project_id]
+        total = session.exec(select(func.count(Event.id)).where(*filters)).one()
+        statement = select(Event).where(*filters).order_by(Event.occurred_at.desc()).limit(ROWS)
+        items = [EventRead.from_orm(event) for event in session.exec(statement).all()]
+        content = {"items": items, "total": total, "page": 1, "page_size": ROWS}
+        return JSONResponse(jsonable_encoder(content)).body
+
+
+def _fast_path(engine, project_id: int) -> bytes:
+    with Session(engine) as session:
+        params = EventQueryParams(page_size=ROWS)
+        return dumps(EventService(session).list_events(project_id, params))
+
+
+def main() -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    project_id = _seed(engine)
+
+    assert _orm_path(engine, project_id) == _fast_path(engine, project_id)
+
+    orm = min(timeit.repeat(lambda: _orm_path(engine, project_id), number=REPEAT, repeat=3)) / REPEAT
+    fast = min(timeit.repeat(lambda: _fast_path(engine, project_id), number=REPEAT, repeat=3)) / REPEAT
+    print(f"orm + pydantic + jsonable_encoder: {orm * 1000:.2f} ms/page")
+    print(f"column tuples + direct json:       {fast * 1000:.2f} ms/page")
+    print(f"speedup: {orm / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.config import get_settings
+from app.models import AlertKind, AlertRule
+from app.services.alert_engine import SlidingWindowCounter, _RuleState, alert_engine
+
+
+@pytest.fixture(autouse=True)
+def reset_alert_engine():
+    alert_engine.reset()
+    yield
+    alert_engine.reset()
+
+
+def test_sliding_window_counter_expires_and_tracks_baseline() -> None:
+    counter = SlidingWindowCounter(window_seconds=60, history_windows=2, slots_per_window=6)
+    for second in range(0, 60, 10):
+        counter.add(second)
+    assert counter.current(59) == 6
+    assert counter.baseline(59) is None  # no completed history window yet
+
+    assert counter.current(95) == 2  # slots are 10s wide, so the window starts at 40s
+    counter.add(125)
+    assert counter.current(175) == 1
+    assert counter.baseline(175) == 3  # six events over the two preceding windows
+
+    restored = SlidingWindowCounter(window_seconds=60, history_windows=2, slots_per_window=6)
+    restored.restore(counter.checkpoint())
+    assert restored.current(175) == 1
+    assert restored.baseline(175) == 3
+
+    assert counter.current(10_000) == 0
+
+
+def test_threshold_rule_fires_on_ingest(client: TestClient, caplog: pytest.LogCaptureFixture) -> None:
+    project = client.post("/api/projects", json={"name": "Alerts"}).json()
+    rule = client.post(
+        f"/api/alerts/project/{project['id']}",
+        json={"name": "Error spike", "event_type": "error", "threshold": 2, "window_seconds": 60},
+    )
+    assert rule.status_code == 201
+    rule_id = rule.json()["id"]
+
+    headers = {"X-API-Key": project["api_key"]}
+    with caplog.at_level(logging.WARNING, logger="app.services.alert_engine"):
+        for name in ("A", "B", "C"):
+            client.post("/api/events", json={"event_type": "error", "name": name}, headers=headers)
+        client.post("/api/events", json={"event_type": "custom", "name": "ignored"}, headers=headers)
+        client.post("/api/events", json={"event_type": "error", "name": "D"}, headers=headers)
+
+    fired = [record for record in caplog.records if "Error spike" in record.getMessage()]
+    assert len(fired) == 1  # the cooldown suppresses the fourth error
+
+    rules = client.get(f"/api/alerts/project/{project['id']}").json()
+    assert rules[0]["current_count"] == 4
+    assert rules[0]["last_fired_at"] is not None
+
+    # Counters resume from the checkpoint written when the alert fired.
+    alert_engine.reset()
+    assert client.get(f"/api/alerts/project/{project['id']}").json()[0]["current_count"] == 3
+
+    assert client.delete(f"/api/alerts/{rule_id}").status_code == 204
+    assert client.get(f"/api/alerts/project/{project['id']}").json() == []
+
+
+def test_rate_change_rule_compares_with_baseline() -> None:
+    state = _RuleState(
+        AlertRule(
+            id=1,
+            project_id=1,
+            name="Surge",
+            kind=AlertKind.RATE_CHANGE,
+            window_seconds=60,
+            threshold=3,
+            baseline_windows=2,
+            min_events=5,
+        )
+    )
+    for second in range(0, 120, 30):  # two events per window
+        state.counter.add(second)
+    for _ in range(7):
+        state.counter.add(179)
+    assert state.counter.baseline(179) == 2
+    assert state.should_fire(179)
+
+    state.counter = SlidingWindowCounter(60, 2)
+    for second in range(0, 120, 30):
+        state.counter.add(second)
+    for _ in range(4):
+        state.counter.add(179)
+    assert not state.should_fire(179)  # below min_events
+
+
+def test_rule_validation(client: TestClient) -> None:
+    project = client.post("/api/projects", json={"name": "Validation"}).json()
+    url = f"/api/alerts/project/{project['id']}"
+    base = {"name": "Rule", "threshold": 1}
+
+    assert client.post(url, json={**base, "baseline_windows": 10**7}).status_code == 422
+    assert client.post(url, json={**base, "webhook_url": "file:///etc/passwd"}).status_code == 422
+    assert client.post(url, json={**base, "webhook_url": "ftp://example.com/hook"}).status_code == 422
+    assert client.post(url, json={**base, "webhook_url": "http://127.0.0.1:9000/hook"}).status_code == 201
+
+
+def test_rules_created_elsewhere_are_picked_up_after_refresh(
+    client: TestClient, engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project = client.post("/api/projects", json={"name": "Workers"}).json()
+    headers = {"X-API-Key": project["api_key"]}
+    client.post(f"/api/alerts/project/{project['id']}", json={"name": "First", "threshold": 100})
+    client.post("/api/events", json={"event_type": "error", "name": "A"}, headers=headers)
+
+    # Another worker inserts a rule; this process has no invalidation signal for it.
+    with Session(engine) as session:
+        session.add(AlertRule(name="Second", threshold=100, project_id=project["id"]))
+        session.commit()
+
+    client.post("/api/events", json={"event_type": "error", "name": "B"}, headers=headers)
+    assert [rule["name"] for rule in client.get(f"/api/alerts/project/{project['id']}").json()] == [
+        "First",
+        "Second",
+    ]
+
+    monkeypatch.setattr(get_settings(), "alert_rules_refresh_seconds", 0.0)
+    client.post("/api/events", json={"event_type": "error", "name": "C"}, headers=headers)
+    counts = {rule["name"]: rule["current_count"] for rule in client.get(f"/api/alerts/project/{project['id']}").json()}
+    assert counts == {"First": 3, "Second": 1}
+
+
+def test_adding_a_rule_keeps_live_counters_of_the_others(client: TestClient) -> None:
+    project = client.post("/api/projects", json={"name": "Live"}).json()
+    url = f"/api/alerts/project/{project['id']}"
+    headers = {"X-API-Key": project["api_key"]}
+    client.post(url, json={"name": "First", "threshold": 100})
+    for name in ("A", "B", "C", "D"):
+        client.post("/api/events", json={"event_type": "error", "name": name}, headers=headers)
+
+    client.post(url, json={"name": "Second", "threshold": 100})
+    counts = {rule["name"]: rule["current_count"] for rule in client.get(url).json()}
+    assert counts == {"First": 4, "Second": 0}
+
+    second_id = next(rule["id"] for rule in client.get(url).json() if rule["name"] == "Second")
+    assert client.delete(f"/api/alerts/{second_id}").status_code == 204
+    assert [(rule["name"], rule["current_count"]) for rule in client.get(url).json()] == [("First", 4)]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, create_engine, select
+
+from app.database import init_db
+from app.models import Event, EventType, to_epoch
+
+# Schema written by releases before occurred_ts and idempotency keys existed.
+LEGACY_SCHEMA = (
+    """
+    CREATE TABLE projects (
+        name VARCHAR NOT NULL,
+        description VARCHAR,
+        id INTEGER NOT NULL,
+        api_key VARCHAR NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE TABLE events (
+        payload JSON,
+        event_type VARCHAR NOT NULL,
+        name VARCHAR NOT NULL,
+        message VARCHAR,
+        user_id VARCHAR,
+        session_id VARCHAR,
+        page_url VARCHAR,
+        user_agent VARCHAR,
+        environment VARCHAR,
+        release VARCHAR,
+        occurred_at DATETIME NOT NULL,
+        id INTEGER NOT NULL,
+        project_id INTEGER NOT NULL,
+        received_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(project_id) REFERENCES projects (id)
+    )
+    """,
+    "INSERT INTO projects VALUES ('Legacy', NULL, 1, 'key', '2024-01-01 00:00:00', '2024-01-01 00:00:00')",
+    "INSERT INTO events (payload, event_type, name, occurred_at, id, project_id, received_at) "
+    "VALUES ('{}', 'error', 'Old', '2024-01-01 09:30:15.250000', 1, 1, '2024-01-01 09:30:16')",
+)
+
+
+def test_init_db_upgrades_legacy_schema() -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.exec_driver_sql(statement)
+
+    init_db(engine)
+    init_db(engine)  # a second run has nothing left to do
+
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("events")}
+    assert {"occurred_ts", "idempotency_key"} <= columns
+    indexes = {index["name"] for index in inspector.get_indexes("events")}
+    assert {
+        "ix_events_project_occurred_ts",
+        "ix_events_project_idempotency_key",
+        "ix_events_project_session_occurred",
+    } <= indexes
+
+    with Session(engine) as session:
+        session.add(
+            Event(project_id=1, event_type=EventType.ERROR, name="New", occurred_at=datetime(2024, 1, 1, 10))
+        )
+        session.commit()
+        stamps = session.exec(select(Event.name, Event.occurred_ts).order_by(Event.id)).all()
+    assert stamps == [
+        ("Old", to_epoch(datetime(2024, 1, 1, 9, 30, 15))),
+        ("New", to_epoch(datetime(2024, 1, 1, 10))),
+    ]
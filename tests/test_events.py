@@ -2,7 +2,14 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.config import get_settings
+from app.models import Event, EventRead
 
 
 def create_project(client: TestClient) -> dict:
@@ -85,3 +92,66 @@ def test_list_events_supports_filters(client: TestClient) -> None:
     filtered = filter_response.json()
     assert filtered["total"] == 1
     assert filtered["items"][0]["event_type"] == "error"
+
+
+def test_list_events_matches_schema_serialization(client: TestClient, engine) -> None:
+    project = create_project(client)
+    now = datetime.utcnow()
+    for index in range(3):
+        response = client.post(
+            "/api/events",
+            json={
+                "event_type": "custom",
+                "name": f"checkout-{index}",
+                "payload": {"cart": [{"sku": "é-1", "price": 12.5}], "nested": {"ok": True, "n": None}},
+                "occurred_at": (now - timedelta(seconds=index)).isoformat(),
+            },
+            headers={"X-API-Key": project["api_key"]},
+        )
+        assert response.status_code == 201
+
+    list_response = client.get(f"/api/events/project/{project['id']}", params={"page_size": 2})
+    assert list_response.status_code == 200
+
+    with Session(engine) as session:
+        statement = (
+            select(Event)
+            .where(Event.project_id == project["id"])
+            .order_by(Event.occurred_at.desc())
+            .limit(2)
+        )
+        items = [EventRead.from_orm(event) for event in session.exec(statement).all()]
+    expected = JSONResponse(
+        jsonable_encoder({"items": items, "total": 3, "page": 1, "page_size": 2})
+    )
+    assert list_response.content == expected.body
+
+
+def test_ingest_is_idempotent(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    project = create_project(client)
+    headers = {"X-API-Key": project["api_key"]}
+    payload = {"event_type": "error", "name": "TypeError"}
+
+    first = client.post("/api/events", json=payload, headers={**headers, "Idempotency-Key": "retry-1"})
+    replay = client.post("/api/events", json=payload, headers={**headers, "Idempotency-Key": "retry-1"})
+    assert first.status_code == 201
+    assert replay.status_code == 200
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json()["id"] == first.json()["id"]
+
+    # Identical events without a key are stored unless key derivation is enabled.
+    timed = {**payload, "occurred_at": datetime(2024, 1, 1, 12, 0, 0).isoformat()}
+    assert client.post("/api/events", json=timed, headers=headers).status_code == 201
+    assert client.post("/api/events", json=timed, headers=headers).status_code == 201
+
+    monkeypatch.setattr(get_settings(), "idempotency_derive_keys", True)
+    derived = {**payload, "occurred_at": datetime(2024, 1, 1, 13, 0, 0).isoformat()}
+    assert client.post("/api/events", json=derived, headers=headers).status_code == 201
+    assert client.post("/api/events", json=derived, headers=headers).status_code == 200
+
+    # Events without occurred_at are never keyed by content.
+    assert client.post("/api/events", json=payload, headers=headers).status_code == 201
+    assert client.post("/api/events", json=payload, headers=headers).status_code == 201
+
+    listing = client.get(f"/api/events/project/{project['id']}").json()
+    assert listing["total"] == 6
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from app.services.idempotency import BloomFilter, WindowedBloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"key-{index}" for index in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+
+
+def test_windowed_bloom_filter_forgets_after_two_windows() -> None:
+    now = [0.0]
+    bloom = WindowedBloomFilter(capacity=100, error_rate=0.01, window_seconds=60, clock=lambda: now[0])
+    bloom.add("retry")
+
+    now[0] = 90
+    assert "retry" in bloom
+
+    now[0] = 200
+    assert "retry" not in bloom
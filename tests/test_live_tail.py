@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import EventQueryParams, EventRead, EventType
+from app.services.event_bus import EventBus
+
+
+def make_event(event_id: int, project_id: int = 1, **overrides) -> EventRead:
+    values = {
+        "id": event_id,
+        "project_id": project_id,
+        "event_type": EventType.ERROR,
+        "name": "TypeError",
+        "received_at": datetime.utcnow(),
+    }
+    values.update(overrides)
+    return EventRead(**values)
+
+
+def test_event_bus_filters_and_drops_oldest() -> None:
+    async def scenario() -> None:
+        bus = EventBus()
+        subscription = bus.subscribe(1, EventQueryParams(event_type=EventType.ERROR, search="type"), max_buffer=2)
+
+        bus.publish(make_event(1))
+        bus.publish(make_event(2, event_type=EventType.CUSTOM))
+        bus.publish(make_event(3, project_id=2))
+        bus.publish(make_event(4, name="Other", message="typeerror in handler"))
+        bus.publish(make_event(5))
+
+        items, dropped = await subscription.get(timeout=1)
+        assert [event_id for event_id, _ in items] == [4, 5]
+        assert dropped == 1
+        assert json.loads(items[1][1])["id"] == 5
+
+        items, dropped = await subscription.get(timeout=0.01)
+        assert items == [] and dropped == 0
+
+        bus.unsubscribe(subscription)
+        bus.publish(make_event(6))
+        assert subscription.dropped == 0 and not bus._subscribers
+
+    asyncio.run(scenario())
+
+
+def test_event_bus_skips_failing_subscribers() -> None:
+    async def scenario() -> None:
+        bus = EventBus()
+        broken = bus.subscribe(1, EventQueryParams(), max_buffer=10)
+        healthy = bus.subscribe(1, EventQueryParams(), max_buffer=10)
+        broken.matches = lambda event: 1 / 0
+
+        bus.publish(make_event(1))
+
+        items, _ = await healthy.get(timeout=1)
+        assert [event_id for event_id, _ in items] == [1]
+
+    asyncio.run(scenario())
+
+
+def test_tail_requires_existing_project(client: TestClient) -> None:
+    assert client.get("/api/events/project/999/tail").status_code == 404
+
+
+def test_tail_streams_matching_events(client: TestClient) -> None:
+    project = client.post("/api/projects", json={"name": "Tail"}).json()
+    headers = {"X-API-Key": project["api_key"]}
+
+    async def scenario() -> bytes:
+        disconnected = asyncio.Event()
+        messages: asyncio.Queue = asyncio.Queue()
+
+        async def receive() -> dict:
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            await messages.put(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/api/events/project/{project['id']}/tail",
+            "raw_path": f"/api/events/project/{project['id']}/tail".encode(),
+            "query_string": b"event_type=error&occurred_from=2024-01-01T00:00:00Z",
+            "headers": [],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        task = asyncio.create_task(app(scope, receive, send))
+        body = b""
+        try:
+            start = await asyncio.wait_for(messages.get(), timeout=5)
+            assert start["status"] == 200
+            while b"retry:" not in body:
+                body += (await asyncio.wait_for(messages.get(), timeout=5)).get("body", b"")
+
+            for event_type, name in (("custom", "Skipped"), ("error", "Boom")):
+                response = await asyncio.to_thread(
+                    client.post,
+                    "/api/events",
+                    json={"event_type": event_type, "name": name, "occurred_at": "2024-06-01T00:00:00+02:00"},
+                    headers=headers,
+                )
+                assert response.status_code == 201
+
+            while b"event: event" not in body:
+                body += (await asyncio.wait_for(messages.get(), timeout=5)).get("body", b"")
+        finally:
+            disconnected.set()
+            await asyncio.wait_for(task, timeout=5)
+        return body
+
+    body = asyncio.run(scenario())
+    frame = body.split(b"event: event\ndata: ", 1)[1].split(b"\n\n", 1)[0]
+    event = json.loads(frame)
+    assert event["name"] == "Boom"
+    assert event["occurred_at"] == "2024-05-31T22:00:00"
+    assert b"Skipped" not in body
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app.config import get_settings
+from app.utils.profiling import QueryProfile, _current_profile
+
+
+def create_project(client: TestClient) -> dict:
+    response = client.post("/api/projects", json={"name": "Profiled"})
+    response.raise_for_status()
+    return response.json()
+
+
+def test_profile_header_is_opt_in(client: TestClient) -> None:
+    project = create_project(client)
+    url = f"/api/events/project/{project['id']}"
+
+    assert "X-Query-Profile" not in client.get(url).headers
+
+    response = client.get(url, headers={"X-Query-Profile": "1"})
+    assert response.status_code == 200
+    summary = dict(part.split("=") for part in response.headers["X-Query-Profile"].split("; "))
+    assert int(summary["queries"]) >= 3  # project lookup, count and page
+    assert "Server-Timing" in response.headers
+
+
+def test_slow_queries_are_logged_with_plan_and_filters(
+    client: TestClient, tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project = create_project(client)
+    log_path = tmp_path / "slow.jsonl"
+    settings = get_settings()
+    monkeypatch.setattr(settings, "slow_query_log_path", str(log_path))
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0.0)
+
+    response = client.get(
+        f"/api/events/project/{project['id']}",
+        params={"event_type": "error", "user_id": "alice@example.com"},
+    )
+    assert response.status_code == 200
+    assert "X-Query-Profile" not in response.headers
+
+    entries = [json.loads(line) for line in log_path.read_text().splitlines()]
+    selects = [entry for entry in entries if "FROM events" in entry["statement"]]
+    assert selects
+    assert all(entry["context"]["filters"] == ["event_type", "user_id"] for entry in selects)
+    assert all(entry["plan"] for entry in selects)
+    assert all(entry["path"] == f"/api/events/project/{project['id']}" for entry in entries)
+    assert "alice@example.com" not in log_path.read_text()
+
+
+def test_failed_statements_do_not_leak_timings(engine) -> None:
+    profile = QueryProfile(method="GET", path="/")
+    token = _current_profile.set(profile)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql("SELECT * FROM missing_table")
+            conn.exec_driver_sql("SELECT 1").all()
+    finally:
+        _current_profile.reset(token)
+    failed, succeeded = profile.queries
+    assert failed.duration_ms == 0.0
+    assert succeeded.duration_ms > 0
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 2").all()  # unprofiled statements leave records alone
+    assert failed.duration_ms == 0.0
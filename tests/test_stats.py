@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 
 from fastapi.testclient import TestClient
 
+from app.config import get_settings
+
 
 def create_project(client: TestClient) -> dict:
     response = client.post("/api/projects", json={"name": "Stats"})
@@ -65,3 +67,176 @@ def test_summary_and_timeseries(client: TestClient) -> None:
     assert len(timeseries) >= 1
     totals = sum(bucket["total"] for bucket in timeseries)
     assert totals == 3
+
+
+def test_timeseries_fills_gaps_for_custom_intervals(client: TestClient) -> None:
+    project = create_project(client)
+    api_key = project["api_key"]
+    start = datetime(2024, 1, 1, 10, 0, 0)
+
+    record_event(client, api_key, event_type="error", name="A", occurred_at=(start + timedelta(minutes=1)).isoformat())
+    record_event(client, api_key, event_type="error", name="B", occurred_at=(start + timedelta(minutes=16)).isoformat())
+
+    response = client.get(
+        f"/api/stats/project/{project['id']}/timeseries",
+        params={
+            "granularity": "5m",
+            "start": start.isoformat(),
+            "end": (start + timedelta(minutes=20)).isoformat(),
+        },
+    )
+    assert response.status_code == 200
+    buckets = response.json()
+    assert [bucket["bucket"] for bucket in buckets] == [
+        (start + timedelta(minutes=offset)).isoformat() for offset in range(0, 25, 5)
+    ]
+    assert [bucket["total"] for bucket in buckets] == [1, 0, 0, 1, 0]
+
+    weekly = client.get(
+        f"/api/stats/project/{project['id']}/timeseries",
+        params={"granularity": "week"},
+    ).json()
+    assert weekly == [
+        {"bucket": "2024-01-01T00:00:00", "counts": {"error": 2, "performance": 0, "interaction": 0, "custom": 0}, "total": 2}
+    ]
+
+
+def test_timeseries_rejects_invalid_granularity_and_large_ranges(client: TestClient) -> None:
+    project = create_project(client)
+    url = f"/api/stats/project/{project['id']}/timeseries"
+
+    assert client.get(url, params={"granularity": "fortnight"}).status_code == 400
+    assert client.get(url, params={"granularity": "0m"}).status_code == 400
+
+    too_many = client.get(
+        url,
+        params={"granularity": "1m", "start": "2024-01-01T00:00:00", "end": "2024-01-31T00:00:00"},
+    )
+    assert too_many.status_code == 400
+
+
+def test_overview_lists_projects_sorted_by_volume(client: TestClient) -> None:
+    quiet = create_project(client)
+    busy = client.post("/api/projects", json={"name": "Busy"}).json()
+    idle = client.post("/api/projects", json={"name": "Idle"}).json()
+    now = datetime.utcnow().replace(microsecond=0)
+
+    record_event(client, quiet["api_key"], event_type="error", name="E", user_id="u1", occurred_at=now.isoformat())
+    for user in ("u1", "u2", "u2"):
+        record_event(client, busy["api_key"], event_type="performance", name="LCP", user_id=user, occurred_at=now.isoformat())
+    record_event(
+        client,
+        busy["api_key"],
+        event_type="error",
+        name="Old",
+        occurred_at=(now - timedelta(days=2)).isoformat(),
+    )
+
+    response = client.get("/api/stats/overview")
+    assert response.status_code == 200
+    overview = response.json()
+    assert overview["total"] == 3
+    assert [item["project_id"] for item in overview["items"]] == [busy["id"], quiet["id"], idle["id"]]
+    first = overview["items"][0]
+    assert first["total_events"] == 3
+    assert first["unique_users"] == 2
+    assert first["counts_by_type"] == {"error": 0, "performance": 3, "interaction": 0, "custom": 0}
+    assert first["latest_event"] == now.isoformat()
+    assert overview["items"][2]["total_events"] == 0
+    assert overview["items"][2]["latest_event"] is None
+
+    paged = client.get("/api/stats/overview", params={"page": 2, "page_size": 2, "order": "asc"}).json()
+    assert [item["project_id"] for item in paged["items"]] == [busy["id"]]
+
+    assert client.get("/api/stats/overview", params={"sort_by": "bogus"}).status_code == 400
+
+
+def test_session_and_funnel_analytics(client: TestClient) -> None:
+    project = create_project(client)
+    api_key = project["api_key"]
+    base_time = datetime(2024, 1, 1, 12, 0, 0)
+    journeys = {
+        "s1": [("view", "/home"), ("signup", "/signup"), ("purchase", "/checkout")],
+        "s2": [("view", "/home"), ("signup", "/signup")],
+        "s3": [("view", "/home")],
+        "s4": [("signup", "/home"), ("view", "/home")],
+    }
+    for session_id, steps in journeys.items():
+        for offset, (name, page_url) in enumerate(steps):
+            record_event(
+                client,
+                api_key,
+                event_type="interaction",
+                name=name,
+                session_id=session_id,
+                page_url=page_url,
+                occurred_at=(base_time + timedelta(seconds=30 * offset)).isoformat(),
+            )
+
+    sessions = client.get(f"/api/stats/project/{project['id']}/sessions").json()
+    assert sessions["sessions"] == 4
+    assert sessions["events"] == 8
+    assert sessions["avg_events_per_session"] == 2
+    assert sessions["max_duration_seconds"] == 60
+    assert sessions["avg_duration_seconds"] == (60 + 30 + 0 + 30) / 4
+    assert sessions["bounce_rate"] == 0.5  # s3 and s4 never left their landing page
+
+    funnel = client.get(
+        f"/api/stats/project/{project['id']}/funnel",
+        params=[("steps", "view"), ("steps", "signup"), ("steps", "purchase")],
+    ).json()
+    assert funnel["sessions"] == 4
+    assert [step["sessions"] for step in funnel["steps"]] == [4, 2, 1]
+    assert funnel["steps"][2]["conversion_from_previous"] == 0.5
+    assert funnel["steps"][2]["conversion_from_start"] == 0.25
+
+    assert client.get(f"/api/stats/project/{project['id']}/funnel").status_code == 422
+
+
+def test_timeseries_normalizes_offsets_and_clamps_open_ranges(client: TestClient, monkeypatch) -> None:
+    project = create_project(client)
+    api_key = project["api_key"]
+    record_event(client, api_key, event_type="error", name="Offset", occurred_at="2024-01-01T10:00:00+02:00")
+    record_event(client, api_key, event_type="error", name="Later", occurred_at="2024-01-02T08:00:00")
+
+    listing = client.get(
+        f"/api/events/project/{project['id']}",
+        params={"occurred_from": "2024-01-01T07:00:00", "occurred_to": "2024-01-01T09:00:00"},
+    ).json()
+    assert listing["total"] == 1
+    assert listing["items"][0]["occurred_at"] == "2024-01-01T08:00:00"
+
+    hourly = client.get(
+        f"/api/stats/project/{project['id']}/timeseries",
+        params={"granularity": "hour", "end": "2024-01-01T12:00:00"},
+    ).json()
+    assert [bucket["bucket"] for bucket in hourly if bucket["total"]] == ["2024-01-01T08:00:00"]
+
+    monkeypatch.setattr(get_settings(), "timeseries_max_points", 10)
+    response = client.get(f"/api/stats/project/{project['id']}/timeseries", params={"granularity": "1m"})
+    assert response.status_code == 200
+    buckets = response.json()
+    assert len(buckets) == 10
+    assert buckets[-1]["bucket"] == "2024-01-02T08:00:00"
+    assert sum(bucket["total"] for bucket in buckets) == 1
+
+
+def test_window_bounds_with_offsets_agree_across_endpoints(client: TestClient) -> None:
+    project = create_project(client)
+    record_event(
+        client,
+        project["api_key"],
+        event_type="interaction",
+        name="view",
+        session_id="s1",
+        occurred_at="2024-01-01T09:00:00",
+    )
+    window = {"start": "2024-01-01T10:00:00+02:00", "end": "2024-01-01T11:00:00+02:00"}
+    base = f"/api/stats/project/{project['id']}"
+
+    assert client.get(f"{base}/sessions", params=window).json()["sessions"] == 1
+    assert client.get(f"{base}/funnel", params={**window, "steps": "view"}).json()["sessions"] == 1
+    assert client.get(f"{base}/summary", params=window).json()["total_events"] == 1
+    assert client.get(f"{base}/summary", params=window).json()["counts_by_type"] == {"interaction": 1}
+    timeseries = client.get(f"{base}/timeseries", params={**window, "granularity": "hour"}).json()
+    assert sum(bucket["total"] for bucket in timeseries) == 1